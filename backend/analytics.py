@@ -10,12 +10,48 @@ import time
 import psutil
 import numpy as np
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
-from scipy import stats
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from scipy.special import stdtrit
 import json
 
 
-@dataclass
+@lru_cache(maxsize=64)
+def _t_critical_95(df: int) -> float:
+    """Two-sided 95% Student's t critical value for the given degrees of freedom"""
+    return float(stdtrit(df, 0.975))
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> tuple:
+    """Field names of a metrics dataclass, resolved once per class"""
+    return tuple(f.name for f in fields(cls))
+
+
+def _metrics_to_dict(metrics) -> Optional[Dict[str, Any]]:
+    """Shallow dict view of a metrics dataclass (no deep copy, unlike dataclasses.asdict)"""
+    if metrics is None:
+        return None
+    return {name: getattr(metrics, name) for name in _field_names(type(metrics))}
+
+
+# Column order of the per-step value buffer kept by AnalyticsCollector
+_RESULT_COLUMNS = ('portfolio_volatility_daily', 'portfolio_volatility_annualized', 'perturbed_value')
+_INITIAL_RESULT_CAPACITY = 16
+
+# Daily-volatility percentiles reported across the statistical and sensitivity metrics
+_VOL_PERCENTILES = (25, 50, 75, 95)
+
+# Simulated hybrid metrics (placeholders until they are measured from the hybrid engine)
+_HYBRID_QUANTUM_CLASSICAL_RATIO = 0.4 / 0.6  # 40% quantum, 60% classical time
+_HYBRID_OVERHEAD = 0.1             # 10% overhead for hybrid approach
+_HYBRID_SYNERGY_FACTOR = 1.15      # 15% synergy improvement
+_HYBRID_GAIN_VS_CLASSICAL = 0.25   # 25% improvement over classical
+_HYBRID_GAIN_VS_QUANTUM = 0.35     # 35% improvement over quantum
+_HYBRID_OPTIMAL_RATIO = 0.45       # 45% quantum, 55% classical
+
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance metrics for sensitivity tests"""
     total_execution_time: float
@@ -25,7 +61,7 @@ class PerformanceMetrics:
     cpu_usage_percent: float
 
 
-@dataclass
+@dataclass(slots=True)
 class QuantumMetrics:
     """Quantum-specific metrics"""
     circuits_per_second: float
@@ -40,7 +76,7 @@ class QuantumMetrics:
     computation_time_comparison: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassicalMetrics:
     """Classical-specific metrics"""
     simulations_per_second: float
@@ -50,7 +86,7 @@ class ClassicalMetrics:
     standard_error: float
 
 
-@dataclass
+@dataclass(slots=True)
 class HybridMetrics:
     """Hybrid-specific metrics"""
     quantum_classical_ratio: float
@@ -61,7 +97,7 @@ class HybridMetrics:
     optimal_hybrid_ratio: float
 
 
-@dataclass
+@dataclass(slots=True)
 class StatisticalMetrics:
     """Statistical analysis metrics"""
     confidence_interval_95: tuple[float, float]
@@ -74,7 +110,7 @@ class StatisticalMetrics:
     sample_size: int
 
 
-@dataclass
+@dataclass(slots=True)
 class SensitivityMetrics:
     """Portfolio-level sensitivity analysis metrics (volatility only)"""
     portfolio_volatility_range: tuple[float, float]
@@ -89,47 +125,64 @@ class SensitivityMetrics:
 class AnalyticsCollector:
     """Collects and computes analytics during sensitivity test execution"""
     
-    def __init__(self, mode: str):
+    __slots__ = (
+        'mode', 'start_time', 'end_time', 'start_memory', 'start_cpu',
+        '_values', '_n', '_vol_percentiles', '_classical_baseline',
+        'performance_metrics', 'quantum_metrics', 'classical_metrics', 'hybrid_metrics',
+        'statistical_metrics', 'sensitivity_metrics', '_proc',
+    )
+    
+    def __init__(self, mode: str, expected_steps: Optional[int] = None):
         self.mode = mode  # 'quantum', 'classical', 'hybrid'
         self.start_time = None
         self.end_time = None
         self.start_memory = None
         self.start_cpu = None
-        self.results = []
+        # Results are kept struct-of-arrays only (see _RESULT_COLUMNS); no per-step dicts are retained.
+        # The buffer is sized up front when the caller knows its step count, so add_result never regrows it
+        capacity = expected_steps if expected_steps and expected_steps > 0 else _INITIAL_RESULT_CAPACITY
+        self._values = np.empty((len(_RESULT_COLUMNS), capacity), dtype=np.float64)
+        self._n = 0
+        self._vol_percentiles = None
+        self._classical_baseline = None
         self.performance_metrics = None
         self.quantum_metrics = None
         self.classical_metrics = None
         self.hybrid_metrics = None
         self.statistical_metrics = None
         self.sensitivity_metrics = None
+        self._proc = psutil.Process()
         
     def start_collection(self):
         """Start collecting analytics data"""
-        self.start_time = time.time()
-        self.start_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-        self.start_cpu = psutil.cpu_percent()
+        self.start_time = time.perf_counter()
+        self.start_memory = self._proc.memory_info().rss / 1024 / 1024  # MB
+        # CPU time consumed by this process so far (user + system)
+        self.start_cpu = self._process_cpu_seconds()
         
     def end_collection(self):
         """End collection and compute final metrics"""
-        self.end_time = time.time()
-        end_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-        end_cpu = psutil.cpu_percent()
+        self.end_time = time.perf_counter()
+        end_memory = self._proc.memory_info().rss / 1024 / 1024  # MB
+        cpu_seconds = self._process_cpu_seconds() - self.start_cpu
         
         # Compute performance metrics
         execution_time = self.end_time - self.start_time
+        # Process CPU utilisation over the run (can exceed 100% with multithreaded numpy)
+        cpu_usage = 100.0 * cpu_seconds / execution_time if execution_time > 0 else 0.0
         memory_usage = end_memory - self.start_memory
-        cpu_usage = (self.start_cpu + end_cpu) / 2
+        n = self._n
         
         self.performance_metrics = PerformanceMetrics(
             total_execution_time=execution_time,
-            throughput=len(self.results) / execution_time if execution_time > 0 else 0,
-            steps_processed=len(self.results),
+            throughput=n / execution_time if execution_time > 0 else 0,
+            steps_processed=n,
             memory_usage_mb=memory_usage,
             cpu_usage_percent=cpu_usage
         )
         
         # Compute statistical metrics
-        if self.results:
+        if n:
             self._compute_statistical_metrics()
             self._compute_sensitivity_metrics()
             
@@ -141,31 +194,80 @@ class AnalyticsCollector:
         elif self.mode == 'hybrid':
             self._compute_hybrid_metrics()
             
+    def _process_cpu_seconds(self) -> float:
+        """User + system CPU seconds consumed by this process"""
+        cpu_times = self._proc.cpu_times()
+        return cpu_times.user + cpu_times.system
+            
     def add_result(self, result: Dict[str, Any]):
         """Add a result to the collection"""
-        self.results.append(result)
+        if self._n == 0:
+            self._classical_baseline = result.get('classical_baseline_volatility')
+        if self._n == self._values.shape[1]:
+            # Amortized doubling keeps appends O(1)
+            grown = np.empty((self._values.shape[0], 2 * self._n), dtype=np.float64)
+            grown[:, :self._n] = self._values
+            self._values = grown
+        self._values[:, self._n] = [result[column] for column in _RESULT_COLUMNS]
+        self._n += 1
+        self._vol_percentiles = None
+        
+    def _result_arrays(self):
+        """Contiguous views of the daily volatility, annualized volatility and perturbed-value columns"""
+        values = self._values[:, :self._n]
+        return values[0], values[1], values[2]
+
+    def _volatility_percentiles(self):
+        """25th/50th/75th/95th daily-volatility percentiles from a single np.percentile call"""
+        if self._vol_percentiles is None:
+            vol_values, _, _ = self._result_arrays()
+            self._vol_percentiles = np.percentile(vol_values, _VOL_PERCENTILES)
+        return self._vol_percentiles
         
     def _compute_statistical_metrics(self):
         """Compute statistical analysis of results (volatility only)"""
-        vol_values = [r['portfolio_volatility_daily'] for r in self.results]
-        mean_vol = np.mean(vol_values)
-        std_vol = np.std(vol_values)
-        if len(vol_values) > 1:
-            confidence_interval = stats.t.interval(
-                0.95,
-                len(vol_values) - 1,
-                loc=mean_vol,
-                scale=stats.sem(vol_values)
+        n = self._n
+        vol_values, _, _ = self._result_arrays()
+        if n < 2:
+            # A single point has no spread: skip the moment/percentile machinery entirely
+            only = float(vol_values[0]) if n else 0.0
+            self.statistical_metrics = StatisticalMetrics(
+                confidence_interval_95=(only, only),
+                coefficient_of_variation=0,
+                skewness=0,
+                kurtosis=0,
+                standard_error=0,
+                median_volatility=only,
+                iqr_volatility=0,
+                sample_size=n
             )
-        else:
-            confidence_interval = (mean_vol, mean_vol)
+            return
+        # Single centered pass: every moment below is derived from the same residuals
+        mean_vol = vol_values.mean()
+        dev = vol_values - mean_vol
+        dev_sq = dev * dev
+        # Corrected two-pass variance: the dev.sum() term cancels the rounding
+        # error left in mean_vol, which matters when volatilities cluster tightly
+        dev_sum = dev.sum()
+        m2 = (dev_sq.sum() - dev_sum * dev_sum / n) / n
+        std_vol = np.sqrt(m2)
+        standard_error = np.sqrt(m2 / (n - 1))
+        half_width = _t_critical_95(n - 1) * standard_error
+        confidence_interval = (mean_vol - half_width, mean_vol + half_width)
         cv = std_vol / mean_vol if mean_vol != 0 else 0
-        skewness = stats.skew(vol_values) if len(vol_values) > 2 else 0
-        kurtosis = stats.kurtosis(vol_values) if len(vol_values) > 2 else 0
-        standard_error = stats.sem(vol_values) if len(vol_values) > 1 else 0
-        median_volatility = float(np.median(vol_values)) if vol_values else 0
-        iqr_volatility = float(np.percentile(vol_values, 75) - np.percentile(vol_values, 25)) if vol_values else 0
-        sample_size = len(vol_values)
+        # Biased (population) estimators, matching scipy.stats.skew/kurtosis defaults;
+        # the third and fourth moments are only needed from three points up
+        # (dot products reduce the residuals without allocating dev**3 / dev**4 temporaries)
+        if n > 2 and m2 > 0:
+            skewness = float(np.dot(dev_sq, dev)) / n / m2 ** 1.5
+            kurtosis = float(np.dot(dev_sq, dev_sq)) / n / (m2 * m2) - 3.0
+        else:
+            skewness = 0
+            kurtosis = 0
+        p25, p50, p75, _ = self._volatility_percentiles()
+        median_volatility = float(p50)
+        iqr_volatility = float(p75 - p25)
+        sample_size = n
         self.statistical_metrics = StatisticalMetrics(
             confidence_interval_95=confidence_interval,
             coefficient_of_variation=cv,
@@ -179,27 +281,26 @@ class AnalyticsCollector:
 
     def _compute_sensitivity_metrics(self):
         """Compute portfolio volatility sensitivity metrics only"""
-        if not self.results:
+        n = self._n
+        if not n:
             return
-        vol_values = [r['portfolio_volatility_daily'] for r in self.results]
-        vol_ann_values = [r['portfolio_volatility_annualized'] for r in self.results]
-        perturbed_values = [r['perturbed_value'] for r in self.results]
+        vol_values, vol_ann_values, perturbed_values = self._result_arrays()
         # Range
-        portfolio_volatility_range = (min(vol_values), max(vol_values))
-        portfolio_volatility_annualized_range = (min(vol_ann_values), max(vol_ann_values))
+        portfolio_volatility_range = (float(vol_values.min()), float(vol_values.max()))
+        portfolio_volatility_annualized_range = (float(vol_ann_values.min()), float(vol_ann_values.max()))
         # 95th percentile of simulated volatility
-        percentile_95_volatility = float(np.percentile(vol_values, 95)) if vol_values else None
+        percentile_95_volatility = float(self._volatility_percentiles()[3])
         # Max sensitivity point (where volatility changes most)
-        if len(vol_values) > 1:
-            vol_diffs = np.abs(np.diff(vol_values))
-            max_diff_idx = np.argmax(vol_diffs)
-            max_sensitivity_point = perturbed_values[max_diff_idx]
-            curve_steepness = np.mean(np.abs(np.diff(vol_values)))
+        if n > 1:
+            abs_diffs = np.abs(np.diff(vol_values))
+            max_diff_idx = int(abs_diffs.argmax())
+            max_sensitivity_point = float(perturbed_values[max_diff_idx])
+            curve_steepness = float(abs_diffs.mean())
         else:
-            max_sensitivity_point = perturbed_values[0] if perturbed_values else 0
+            max_sensitivity_point = float(perturbed_values[0])
             curve_steepness = 0
-        baseline_portfolio_volatility_daily = vol_values[0] if vol_values else 0
-        baseline_portfolio_volatility_annualized = vol_ann_values[0] if vol_ann_values else 0
+        baseline_portfolio_volatility_daily = float(vol_values[0])
+        baseline_portfolio_volatility_annualized = float(vol_ann_values[0])
         self.sensitivity_metrics = SensitivityMetrics(
             portfolio_volatility_range=portfolio_volatility_range,
             portfolio_volatility_annualized_range=portfolio_volatility_annualized_range,
@@ -218,30 +319,29 @@ class AnalyticsCollector:
         # Simulate quantum metrics (in real implementation, these would come from actual quantum execution)
         execution_time = self.performance_metrics.total_execution_time
         steps = self.performance_metrics.steps_processed
+        inv_time = 1.0 / execution_time if execution_time > 0 else 0.0
         
         # Quantum circuit metrics (simulated)
-        circuits_per_second = steps / execution_time if execution_time > 0 else 0
+        circuits_per_second = steps * inv_time
         shots_per_second = circuits_per_second * 1024  # Assuming 1024 shots per circuit
         circuit_depth = 8  # Simulated circuit depth
         total_qubits = 4   # Simulated qubit count
         quantum_operations = steps * circuit_depth * total_qubits
         
         # Enhancement factor (simulated quantum advantage)
-        if self.results:
-            classical_baseline = self.results[0].get('classical_baseline_volatility')
-            quantum_results = [r['portfolio_volatility_daily'] for r in self.results]
-            quantum_baseline = quantum_results[0] if quantum_results else 0
-            enhancement_factor = np.mean(quantum_results) / classical_baseline if classical_baseline and classical_baseline != 0 else 1
+        if self._n:
+            classical_baseline = self._classical_baseline
+            quantum_results, _, _ = self._result_arrays()
+            quantum_baseline = float(quantum_results[0]) if quantum_results.size else 0
+            enhancement_factor = quantum_results.mean() / classical_baseline if classical_baseline and classical_baseline != 0 else 1
             # Risk reduction ratio (classical/quantum)
             risk_reduction_ratio = classical_baseline / quantum_baseline if classical_baseline and quantum_baseline and quantum_baseline != 0 else None
             # Quantum advantage ratio (legacy, not recommended):
             quantum_advantage_ratio = enhancement_factor - 1 if enhancement_factor > 1 else 0
-            measurement_probabilities = {}
         else:
             enhancement_factor = 1.0
             risk_reduction_ratio = None
             quantum_advantage_ratio = 0.0
-            measurement_probabilities = {}
         
         # Computation time comparison (if available)
         computation_time_comparison = None
@@ -258,7 +358,7 @@ class AnalyticsCollector:
             total_qubits=total_qubits,
             quantum_operations=quantum_operations,
             enhancement_factor=enhancement_factor,
-            measurement_probabilities=measurement_probabilities,
+            measurement_probabilities={},  # not measured by the statevector estimator
             quantum_advantage_ratio=quantum_advantage_ratio,
             risk_reduction_ratio=risk_reduction_ratio,
             computation_time_comparison=computation_time_comparison
@@ -270,17 +370,17 @@ class AnalyticsCollector:
             return
             
         execution_time = self.performance_metrics.total_execution_time
-        steps = self.performance_metrics.steps_processed
+        inv_time = 1.0 / execution_time if execution_time > 0 else 0.0
         
         # Monte Carlo metrics
-        simulations_per_second = 10000 / execution_time if execution_time > 0 else 0  # Assuming 10k simulations per step
+        simulations_per_second = 10000 * inv_time  # Assuming 10k simulations per step
         iterations_per_second = simulations_per_second * 252  # Assuming 252 time periods
         
         # Convergence analysis (simulated)
         convergence_rate = 0.95  # Simulated convergence rate
         
         # Monte Carlo efficiency
-        monte_carlo_efficiency = simulations_per_second / (execution_time * 1000)  # Normalized efficiency
+        monte_carlo_efficiency = simulations_per_second * inv_time / 1000  # Normalized efficiency
         
         # Standard error
         if self.statistical_metrics:
@@ -301,90 +401,90 @@ class AnalyticsCollector:
         if not self.performance_metrics:
             return
             
-        execution_time = self.performance_metrics.total_execution_time
-        
-        # Hybrid ratios (simulated)
-        quantum_time_ratio = 0.4  # 40% quantum, 60% classical
-        classical_time_ratio = 0.6
-        
-        # Hybrid overhead
-        hybrid_overhead = 0.1  # 10% overhead for hybrid approach
-        
-        # Synergy factor (how well quantum and classical work together)
-        synergy_factor = 1.15  # 15% synergy improvement
-        
-        # Efficiency gains
-        efficiency_gain_vs_classical = 0.25  # 25% improvement over classical
-        efficiency_gain_vs_quantum = 0.35    # 35% improvement over quantum
-        
-        # Optimal hybrid ratio
-        optimal_hybrid_ratio = 0.45  # 45% quantum, 55% classical
-        
+        # All hybrid metrics are simulated constants (see _HYBRID_* above)
         self.hybrid_metrics = HybridMetrics(
-            quantum_classical_ratio=quantum_time_ratio / classical_time_ratio,
-            hybrid_overhead=hybrid_overhead,
-            synergy_factor=synergy_factor,
-            efficiency_gain_vs_classical=efficiency_gain_vs_classical,
-            efficiency_gain_vs_quantum=efficiency_gain_vs_quantum,
-            optimal_hybrid_ratio=optimal_hybrid_ratio
+            quantum_classical_ratio=_HYBRID_QUANTUM_CLASSICAL_RATIO,
+            hybrid_overhead=_HYBRID_OVERHEAD,
+            synergy_factor=_HYBRID_SYNERGY_FACTOR,
+            efficiency_gain_vs_classical=_HYBRID_GAIN_VS_CLASSICAL,
+            efficiency_gain_vs_quantum=_HYBRID_GAIN_VS_QUANTUM,
+            optimal_hybrid_ratio=_HYBRID_OPTIMAL_RATIO
         )
         
     def get_analytics_summary(self) -> Dict[str, Any]:
         """Get comprehensive analytics summary"""
         summary = {
             'mode': self.mode,
-            'performance_metrics': self.performance_metrics.__dict__ if self.performance_metrics else None,
-            'statistical_metrics': self.statistical_metrics.__dict__ if self.statistical_metrics else None,
+            'performance_metrics': _metrics_to_dict(self.performance_metrics),
+            'statistical_metrics': _metrics_to_dict(self.statistical_metrics),
         }
         
         if self.mode == 'quantum' and self.quantum_metrics:
-            summary['quantum_metrics'] = self.quantum_metrics.__dict__
+            summary['quantum_metrics'] = _metrics_to_dict(self.quantum_metrics)
         elif self.mode == 'classical' and self.classical_metrics:
-            summary['classical_metrics'] = self.classical_metrics.__dict__
+            summary['classical_metrics'] = _metrics_to_dict(self.classical_metrics)
         elif self.mode == 'hybrid' and self.hybrid_metrics:
-            summary['hybrid_metrics'] = self.hybrid_metrics.__dict__
+            summary['hybrid_metrics'] = _metrics_to_dict(self.hybrid_metrics)
             
         if self.sensitivity_metrics:
-            summary['sensitivity_metrics'] = self.sensitivity_metrics.__dict__
+            summary['sensitivity_metrics'] = _metrics_to_dict(self.sensitivity_metrics)
             
         return summary
 
 
+_format_4f = '{:.4f}'.format
+
+
+def _format_range(bounds) -> Dict[str, str]:
+    return {'min': _format_4f(bounds[0]), 'max': _format_4f(bounds[1])}
+
+
+def _format_optional_4f(value) -> Optional[str]:
+    return _format_4f(value) if value is not None else None
+
+
+# Frontend formatting tables: (output key, source metric key, formatter).
+# A formatter of None passes the metric value through unchanged.
+_PERFORMANCE_FORMATS = (
+    ('execution_time', 'total_execution_time', '{:.3f}s'.format),
+    ('throughput', 'throughput', '{:.1f} steps/s'.format),
+    ('steps_processed', 'steps_processed', None),
+    ('memory_usage', 'memory_usage_mb', '{:.1f} MB'.format),
+    ('cpu_usage', 'cpu_usage_percent', '{:.1f}%'.format),
+)
+
+_STATISTICAL_FORMATS = (
+    ('confidence_interval', 'confidence_interval_95', '({0[0]:.4f}, {0[1]:.4f})'.format),
+    ('coefficient_of_variation', 'coefficient_of_variation', _format_4f),
+    ('skewness', 'skewness', _format_4f),
+    ('kurtosis', 'kurtosis', _format_4f),
+    ('standard_error', 'standard_error', _format_4f),
+    ('median_volatility', 'median_volatility', None),
+    ('iqr_volatility', 'iqr_volatility', None),
+    ('sample_size', 'sample_size', None),
+)
+
+_SENSITIVITY_FORMATS = (
+    ('portfolio_volatility_range', 'portfolio_volatility_range', _format_range),
+    ('portfolio_volatility_annualized_range', 'portfolio_volatility_annualized_range', _format_range),
+    ('max_sensitivity_point', 'max_sensitivity_point', _format_4f),
+    ('curve_steepness', 'curve_steepness', _format_4f),
+    ('baseline_portfolio_volatility_daily', 'baseline_portfolio_volatility_daily', _format_4f),
+    ('baseline_portfolio_volatility_annualized', 'baseline_portfolio_volatility_annualized', _format_4f),
+    ('percentile_95_volatility', 'percentile_95_volatility', _format_optional_4f),
+)
+
+
+def _format_section(section: Dict[str, Any], spec) -> Dict[str, Any]:
+    return {key: fmt(section[source]) if fmt else section[source] for key, source, fmt in spec}
+
+
 def format_analytics_for_frontend(analytics: Dict[str, Any]) -> Dict[str, Any]:
     """Format analytics data for frontend consumption (volatility only)"""
     formatted = {
-        'performance': {
-            'execution_time': f"{analytics['performance_metrics']['total_execution_time']:.3f}s",
-            'throughput': f"{analytics['performance_metrics']['throughput']:.1f} steps/s",
-            'steps_processed': analytics['performance_metrics']['steps_processed'],
-            'memory_usage': f"{analytics['performance_metrics']['memory_usage_mb']:.1f} MB",
-            'cpu_usage': f"{analytics['performance_metrics']['cpu_usage_percent']:.1f}%"
-        },
-        'statistical': {
-            'confidence_interval': f"({analytics['statistical_metrics']['confidence_interval_95'][0]:.4f}, {analytics['statistical_metrics']['confidence_interval_95'][1]:.4f})",
-            'coefficient_of_variation': f"{analytics['statistical_metrics']['coefficient_of_variation']:.4f}",
-            'skewness': f"{analytics['statistical_metrics']['skewness']:.4f}",
-            'kurtosis': f"{analytics['statistical_metrics']['kurtosis']:.4f}",
-            'standard_error': f"{analytics['statistical_metrics']['standard_error']:.4f}",
-            'median_volatility': analytics['statistical_metrics']['median_volatility'],
-            'iqr_volatility': analytics['statistical_metrics']['iqr_volatility'],
-            'sample_size': analytics['statistical_metrics']['sample_size']
-        }
+        'performance': _format_section(analytics['performance_metrics'], _PERFORMANCE_FORMATS),
+        'statistical': _format_section(analytics['statistical_metrics'], _STATISTICAL_FORMATS)
     }
     if 'sensitivity_metrics' in analytics:
-        formatted['sensitivity'] = {
-            'portfolio_volatility_range': {
-                'min': f"{analytics['sensitivity_metrics']['portfolio_volatility_range'][0]:.4f}",
-                'max': f"{analytics['sensitivity_metrics']['portfolio_volatility_range'][1]:.4f}"
-            },
-            'portfolio_volatility_annualized_range': {
-                'min': f"{analytics['sensitivity_metrics']['portfolio_volatility_annualized_range'][0]:.4f}",
-                'max': f"{analytics['sensitivity_metrics']['portfolio_volatility_annualized_range'][1]:.4f}"
-            },
-            'max_sensitivity_point': f"{analytics['sensitivity_metrics']['max_sensitivity_point']:.4f}",
-            'curve_steepness': f"{analytics['sensitivity_metrics']['curve_steepness']:.4f}",
-            'baseline_portfolio_volatility_daily': f"{analytics['sensitivity_metrics']['baseline_portfolio_volatility_daily']:.4f}",
-            'baseline_portfolio_volatility_annualized': f"{analytics['sensitivity_metrics']['baseline_portfolio_volatility_annualized']:.4f}",
-            'percentile_95_volatility': f"{analytics['sensitivity_metrics']['percentile_95_volatility']:.4f}" if analytics['sensitivity_metrics'].get('percentile_95_volatility') is not None else None
-        }
-    return formatted 
\ No newline at end of file
+        formatted['sensitivity'] = _format_section(analytics['sensitivity_metrics'], _SENSITIVITY_FORMATS)
+    return formatted
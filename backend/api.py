@@ -4,16 +4,21 @@ api.py
 Backend API entry point for KANOSYM. Exposes endpoints for portfolio input, perturbation, QAE, and results formatting.
 """
 
-from flask import Flask, request, jsonify, send_from_directory, make_response
-from flask_cors import CORS
+from flask import Flask, Response, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+import orjson
 from noira.chat_controller import chat_controller
 import os
 import logging
+import hashlib
+import importlib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
 import werkzeug.serving
-from model_blocks.quantum.quantum_sensitivity import quantum_sensitivity_test
-from model_blocks.classical.classical_sensitivity import classical_sensitivity_test
-from model_blocks.hybrid.hybrid_sensitivity import hybrid_sensitivity_test
 from file_manager import FileManager
 import numpy as np
 from datetime import datetime
@@ -25,12 +30,70 @@ from utils import check_correlation_perturbation_validity
 # Load environment variables
 load_dotenv()
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes responses and decodes request bodies with orjson.
+
+    orjson serializes numpy scalars/arrays natively, so analytics summaries
+    can be returned without converting every reduction result to a float.
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    # Responses are consumed by the frontend, never read by hand: skip the key
+    # sort and the debug-mode indentation DefaultJSONProvider would apply
+    sort_keys = False
+    compact = True
+
+    def dumps(self, obj, **kwargs):
+        option = self.option
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        # orjson.JSONDecodeError subclasses ValueError, so request.get_json()
+        # still turns malformed bodies into a 400
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
-CORS(app)
+app.json = OrjsonProvider(app)
+
+# The frontend dev server runs on another origin, so every response carries
+# the CORS headers; preflights are answered by Flask's automatic OPTIONS.
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+@app.after_request
+def add_cors_headers(response):
+    response.headers.update(CORS_HEADERS)
+    return response
+
+# Largest JSON request body accepted; oversized bodies are refused before they
+# are read or parsed. File uploads are multipart and not affected.
+MAX_JSON_BODY_BYTES = 16 * 1024 * 1024
+
+@app.before_request
+def reject_oversized_json():
+    if not request.is_json:
+        return None
+    if request.content_length is None and 'chunked' in request.headers.get('Transfer-Encoding', '').lower():
+        # A chunked body has no length to check up front, so it could not be
+        # held to the limit; the frontend always sends Content-Length
+        return jsonify({"success": False, "error": "Content-Length required for JSON bodies"}), 411
+    if (request.content_length or 0) > MAX_JSON_BODY_BYTES:
+        return jsonify({"success": False, "error": "Request body too large"}), 413
 
 # Initialize file manager
 file_manager = FileManager()
 
+# project name -> (autosave body digest, .ksm version written for it)
+last_autosaves = {}
+
 # Set up logger
 logger = logging.getLogger("kanosym")
 logging.basicConfig(
@@ -53,6 +116,28 @@ class FilteredRequestHandler(werkzeug.serving.WSGIRequestHandler):
             return
         super().log_request(code, size)
 
+# Request validation tables, built once at import
+REQUIRED_PORTFOLIO_FIELDS = ('assets', 'weights', 'volatility', 'correlation_matrix')
+REQUIRED_PORTFOLIO_FIELD_SET = frozenset(REQUIRED_PORTFOLIO_FIELDS)
+SENSITIVITY_PARAMS = ('volatility', 'weight', 'correlation')
+SENSITIVITY_REQUEST_FIELDS = ('portfolio', 'param', 'asset', 'range', 'steps')
+
+# Per-parameter test-range check: (is_out_of_bounds(min_val, max_val), error message)
+PARAM_RANGE_CHECKS = {
+    'weight': (
+        lambda min_val, max_val: min_val < 0 or max_val > 1,
+        "Weight test range must be between 0 and 1 (weights cannot be negative)"
+    ),
+    'volatility': (
+        lambda min_val, max_val: min_val <= 0 or max_val <= 0,
+        "Volatility test range must contain only positive values (volatility cannot be zero or negative)"
+    ),
+    'correlation': (
+        lambda min_val, max_val: min_val < -0.5 or max_val > 0.5,
+        "Correlation delta perturbation range must be between -0.5 and 0.5 (large deltas can create invalid correlation matrices)"
+    ),
+}
+
 def validate_portfolio(portfolio):
     """
     Validate portfolio data structure and constraints.
@@ -65,38 +150,58 @@ def validate_portfolio(portfolio):
     """
     if not portfolio:
         return False, "Portfolio data is required"
+    if not isinstance(portfolio, dict):
+        return False, "Portfolio must be an object with assets, weights, volatility and correlation_matrix"
     
-    # Check required fields
-    required_fields = ['assets', 'weights', 'volatility', 'correlation_matrix']
-    for field in required_fields:
-        if field not in portfolio:
-            return False, f"Missing required field: {field}"
+    # Check required fields (one key-view comparison; the ordered scan only runs
+    # to name the first missing field)
+    if not portfolio.keys() >= REQUIRED_PORTFOLIO_FIELD_SET:
+        for field in REQUIRED_PORTFOLIO_FIELDS:
+            if field not in portfolio:
+                return False, f"Missing required field: {field}"
     
     assets = portfolio['assets']
     weights = portfolio['weights']
     volatility = portfolio['volatility']
     correlation_matrix = portfolio['correlation_matrix']
     
-    # Convert all values in correlation_matrix to float to avoid TypeError
-    if correlation_matrix:
-        correlation_matrix = [
-            [float(val) for val in row]
-            for row in correlation_matrix
-        ]
-    
     # Convert all values to float to avoid dtype errors
-    if weights:
+    try:
         weights = [float(w) for w in weights]
-        portfolio['weights'] = weights
-    if volatility:
         volatility = [float(v) for v in volatility]
-        portfolio['volatility'] = volatility
-    if correlation_matrix:
         correlation_matrix = [
             [float(val) for val in row]
             for row in correlation_matrix
         ]
-        portfolio['correlation_matrix'] = correlation_matrix
+    except (TypeError, ValueError):
+        return False, "Weights, volatility and correlation values must be numbers"
+    portfolio['weights'] = weights
+    portfolio['volatility'] = volatility
+    portfolio['correlation_matrix'] = correlation_matrix
+    
+    # The fingerprint below encodes NaN/inf as null, so they must be caught here
+    if not (all(map(math.isfinite, weights))
+            and all(map(math.isfinite, volatility))
+            and all(math.isfinite(val) for row in correlation_matrix for val in row)):
+        return False, "Weights, volatility and correlation values must be finite numbers"
+    
+    # The remaining checks only depend on these four values, so a portfolio that is
+    # re-sent unchanged (with a different param/asset/range) is answered from the cache
+    fingerprint = orjson.dumps([assets, weights, volatility, correlation_matrix])
+    return validate_portfolio_values(fingerprint)
+
+@lru_cache(maxsize=256)
+def validate_portfolio_values(fingerprint):
+    """
+    Check portfolio shapes and values, memoized on their serialized form.
+    
+    Args:
+        fingerprint: orjson-encoded [assets, weights, volatility, correlation_matrix]
+        
+    Returns:
+        tuple: (is_valid, error_message)
+    """
+    assets, weights, volatility, correlation_matrix = orjson.loads(fingerprint)
     
     # Check asset count constraints
     if len(assets) < 1:
@@ -117,30 +222,32 @@ def validate_portfolio(portfolio):
             return False, "Correlation matrix must be square"
     
     # Validate weights (should sum to 1, all positive)
-    total_weight = sum(weights)
+    total_weight = math.fsum(weights)  # exactly rounded, unlike sum()
     if abs(total_weight - 1.0) > 0.01:  # Allow small floating point errors
         return False, f"Weights must sum to 1.0 (current sum: {total_weight:.3f})"
     
-    for i, weight in enumerate(weights):
-        if weight < 0:
-            return False, f"Weight for asset {assets[i]} must be non-negative"
+    negative = np.flatnonzero(np.asarray(weights, dtype=np.float64) < 0)
+    if negative.size:
+        return False, f"Weight for asset {assets[negative[0]]} must be non-negative"
     
     # Validate volatility (all positive)
-    for i, vol in enumerate(volatility):
-        if vol <= 0:
-            return False, f"Volatility for asset {assets[i]} must be positive"
+    non_positive = np.flatnonzero(np.asarray(volatility, dtype=np.float64) <= 0)
+    if non_positive.size:
+        return False, f"Volatility for asset {assets[non_positive[0]]} must be positive"
     
     # Validate correlation matrix (symmetric, diagonal = 1, values in [-1, 1])
-    for i in range(len(assets)):
-        for j in range(len(assets)):
-            if i == j:
-                if abs(correlation_matrix[i][j] - 1.0) > 0.01:
-                    return False, f"Correlation matrix diagonal must be 1.0 for asset {assets[i]}"
-            else:
-                if abs(correlation_matrix[i][j] - correlation_matrix[j][i]) > 0.01:
-                    return False, f"Correlation matrix must be symmetric"
-                if correlation_matrix[i][j] < -1 or correlation_matrix[i][j] > 1:
-                    return False, f"Correlation values must be between -1 and 1"
+    corr = np.asarray(correlation_matrix, dtype=np.float64)
+    bad_diagonal = np.flatnonzero(np.abs(np.diagonal(corr) - 1.0) > 0.01)
+    if bad_diagonal.size:
+        return False, f"Correlation matrix diagonal must be 1.0 for asset {assets[bad_diagonal[0]]}"
+    # Each off-diagonal pair only needs comparing once: upper triangle vs its mirror
+    upper = np.triu_indices(len(assets), k=1)
+    upper_vals = corr[upper]
+    lower_vals = corr.T[upper]
+    if (np.abs(upper_vals - lower_vals) > 0.01).any():
+        return False, "Correlation matrix must be symmetric"
+    if (np.abs(upper_vals) > 1).any() or (np.abs(lower_vals) > 1).any():
+        return False, "Correlation values must be between -1 and 1"
     
     return True, ""
 
@@ -159,41 +266,63 @@ def validate_sensitivity_params(param, asset, range_vals, steps, portfolio):
         tuple: (is_valid, error_message)
     """
     # Validate parameter type
-    valid_params = ['volatility', 'weight', 'correlation']
-    if param not in valid_params:
-        return False, f"Invalid parameter: {param}. Must be one of {valid_params}"
+    if not isinstance(param, str) or param not in PARAM_RANGE_CHECKS:
+        return False, f"Invalid parameter: {param}. Must be one of {list(SENSITIVITY_PARAMS)}"
     
     # Validate asset exists in portfolio
     if asset not in portfolio['assets']:
         return False, f"Asset '{asset}' not found in portfolio"
     
     # Validate range
-    if len(range_vals) != 2:
+    if not isinstance(range_vals, (list, tuple)) or len(range_vals) != 2:
         return False, "Range must have exactly 2 values [min, max]"
     
     min_val, max_val = range_vals
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)
+               for v in (min_val, max_val)):
+        return False, "Range values must be finite numbers"
     if min_val >= max_val:
         return False, "Range min must be less than range max"
     
     # Validate parameter-specific constraints
-    asset_idx = portfolio['assets'].index(asset)
-    
-    if param == 'weight':
-        if min_val < 0 or max_val > 1:
-            return False, "Weight test range must be between 0 and 1 (weights cannot be negative)"
-    elif param == 'volatility':
-        if min_val <= 0 or max_val <= 0:
-            return False, "Volatility test range must contain only positive values (volatility cannot be zero or negative)"
-    elif param == 'correlation':
-        if min_val < -0.5 or max_val > 0.5:
-            return False, "Correlation delta perturbation range must be between -0.5 and 0.5 (large deltas can create invalid correlation matrices)"
+    is_out_of_bounds, bounds_error = PARAM_RANGE_CHECKS[param]
+    if is_out_of_bounds(min_val, max_val):
+        return False, bounds_error
     
     # Validate steps
-    if steps < 2 or steps > 20:
+    if not isinstance(steps, int) or isinstance(steps, bool) or steps < 2 or steps > 20:
         return False, "Steps must be between 2 and 20"
     
     return True, ""
 
+def parse_sensitivity_request(data, label):
+    """
+    Extract and validate the fields shared by the sensitivity endpoints.
+    
+    Args:
+        data: Parsed request body
+        label: Log prefix of the calling endpoint (e.g. 'QUANTUM')
+        
+    Returns:
+        tuple: ((portfolio, param, asset, range_vals, steps), error_message);
+        error_message is empty when the request is valid
+    """
+    portfolio, param, asset, range_vals, steps = map(data.get, SENSITIVITY_REQUEST_FIELDS)
+    
+    # Validate portfolio
+    is_valid, error_msg = validate_portfolio(portfolio)
+    if not is_valid:
+        logger.error(f"[{label}] Portfolio validation failed: {error_msg}")
+        return None, error_msg
+    
+    # Validate sensitivity parameters
+    is_valid, error_msg = validate_sensitivity_params(param, asset, range_vals, steps, portfolio)
+    if not is_valid:
+        logger.error(f"[{label}] Sensitivity param validation failed: {error_msg}")
+        return None, error_msg
+    
+    return (portfolio, param, asset, range_vals, steps), ""
+
 def sanitize_for_json(obj):
     if isinstance(obj, dict):
         return {k: sanitize_for_json(v) for k, v in obj.items()}
@@ -206,6 +335,59 @@ def sanitize_for_json(obj):
     else:
         return obj
 
+# Background sensitivity jobs. A sensitivity request that sets "async": true is
+# queued here and answered with 202 + a job id instead of holding the HTTP
+# connection open for the whole sweep; the frontend's default synchronous
+# requests are unaffected.
+sensitivity_executor = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2),
+                                          thread_name_prefix='sensitivity')
+# Finished jobs nobody polls are dropped after this long, with their results
+SENSITIVITY_JOB_TTL_SECONDS = 15 * 60
+sensitivity_jobs = {}  # job id -> Future
+sensitivity_job_expiry = {}  # job id -> monotonic deadline, set once the job finishes
+sensitivity_jobs_lock = threading.Lock()
+
+def evict_expired_sensitivity_jobs():
+    """Forget finished jobs whose results were not collected within the TTL"""
+    now = time.monotonic()
+    with sensitivity_jobs_lock:
+        expired = [job_id for job_id, deadline in sensitivity_job_expiry.items() if deadline <= now]
+        for job_id in expired:
+            sensitivity_job_expiry.pop(job_id, None)
+            sensitivity_jobs.pop(job_id, None)
+
+def dispatch_sensitivity_request(data, run):
+    """
+    Run a validated sensitivity request inline, or queue it as a background job.
+    
+    Args:
+        data: Parsed request body
+        run: Zero-argument callable returning (payload, status_code)
+        
+    Returns:
+        Flask response tuple
+    """
+    if not data.get('async'):
+        payload, status = run()
+        return jsonify(payload), status
+    
+    evict_expired_sensitivity_jobs()
+    job_id = uuid.uuid4().hex
+    
+    def expire(_future):
+        with sensitivity_jobs_lock:
+            if job_id in sensitivity_jobs:
+                sensitivity_job_expiry[job_id] = time.monotonic() + SENSITIVITY_JOB_TTL_SECONDS
+    
+    with sensitivity_jobs_lock:
+        future = sensitivity_jobs[job_id] = sensitivity_executor.submit(run)
+    future.add_done_callback(expire)
+    return jsonify({
+        "success": True,
+        "job_id": job_id,
+        "status": "pending"
+    }), 202, {"Location": f"/api/sensitivity/jobs/{job_id}"}
+
 # Chat endpoints
 @app.route('/api/chat/set-api-key', methods=['POST'])
 def set_api_key():
@@ -240,7 +422,7 @@ def send_message():
     
     return jsonify(result), 200 if result['success'] else 400
 
-@app.route('/api/chat/send/stream', methods=['POST', 'OPTIONS'])
+@app.route('/api/chat/send/stream', methods=['POST'])
 def send_message_stream():
     """Send a message to Noira and stream the response."""
     from flask import Response, stream_with_context
@@ -248,14 +430,6 @@ def send_message_stream():
     from queue import Queue, Empty
     from threading import Thread
 
-    # Handle OPTIONS request for CORS
-    if request.method == 'OPTIONS':
-        response = make_response()
-        response.headers['Access-Control-Allow-Origin'] = '*'
-        response.headers['Access-Control-Allow-Methods'] = 'POST, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
-        return response
-    
     data = request.get_json()
     message = data.get('message')
     context = data.get('context', {})
@@ -378,237 +552,160 @@ def quantum_analysis():
     """Quantum analysis endpoint (placeholder)"""
     return jsonify({"message": "QAE endpoint - not implemented yet"})
 
-@app.route('/api/quantum_sensitivity_test', methods=['POST'])
-def quantum_sensitivity_test_api():
-    data = request.get_json()
-    logger.info(f"[QUANTUM] Incoming request data: {data}")
-    portfolio = data.get('portfolio')
-    param = data.get('param')
-    asset = data.get('asset')
-    range_vals = data.get('range')
-    steps = data.get('steps')
-    use_noise_model = data.get('use_noise_model', False)  # Extract noise model parameter
-    noise_model_type = data.get('noise_model_type', 'fast')  # Extract noise model type
-    project_id = data.get('project_id')  # New: project_id for autosave
+# Sensitivity engines: engine -> (log label, model block module, test function,
+# extra request fields forwarded to the test function with their defaults).
+# Model blocks are imported on first use so chat/project-only sessions don't
+# load the simulation stack.
+SENSITIVITY_ENGINES = {
+    'quantum': ('QUANTUM', 'model_blocks.quantum.quantum_sensitivity', 'quantum_sensitivity_test',
+                {'use_noise_model': False, 'noise_model_type': 'fast'}),
+    'classical': ('CLASSICAL', 'model_blocks.classical.classical_sensitivity', 'classical_sensitivity_test', {}),
+    'hybrid': ('HYBRID', 'model_blocks.hybrid.hybrid_sensitivity', 'hybrid_sensitivity_test', {}),
+}
+
+@app.route('/api/sensitivity/<engine>', methods=['POST'])
+def sensitivity_test_api(engine):
+    """Run a quantum, classical or hybrid sensitivity test"""
+    if engine not in SENSITIVITY_ENGINES:
+        return jsonify({"success": False, "error": f"Unknown sensitivity engine: {engine}"}), 404
+    label, module_name, function_name, model_option_defaults = SENSITIVITY_ENGINES[engine]
     
-    # Validate portfolio
-    is_valid, error_msg = validate_portfolio(portfolio)
-    if not is_valid:
-        logger.error(f"[QUANTUM] Portfolio validation failed: {error_msg}")
-        return jsonify({"success": False, "error": error_msg}), 400
-    
-    # Validate sensitivity parameters
-    is_valid, error_msg = validate_sensitivity_params(param, asset, range_vals, steps, portfolio)
-    if not is_valid:
-        logger.error(f"[QUANTUM] Sensitivity param validation failed: {error_msg}")
+    # Parsed once (Flask caches it); a missing, malformed or non-object body falls
+    # through to the validators' 400 instead of failing on None or a list
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    logger.info(f"[{label}] Incoming request data: {data}")
+    sensitivity_args, error_msg = parse_sensitivity_request(data, label)
+    if error_msg:
         return jsonify({"success": False, "error": error_msg}), 400
+    portfolio, param, asset, range_vals, steps = sensitivity_args
+    model_options = {field: data.get(field, default) for field, default in model_option_defaults.items()}
+    project_id = data.get('project_id')  # New: project_id for autosave
     
-    try:
-        result = quantum_sensitivity_test(
-            portfolio=portfolio,
-            param=param,
-            asset=asset,
-            range_vals=range_vals,
-            steps=steps,
-            use_noise_model=use_noise_model,
-            noise_model_type=noise_model_type
-        )
-        logger.info(f"[QUANTUM] Model result: {result}")
-        
-        # Auto-save test run if project_id is provided
-        if project_id:
-            try:
-                # Save test run data in the same format as returned to frontend
-                test_run_data = {
-                    **result,  # Include all result data at the top level
-                    "block_type": "quantum",
-                    "parameters": {
-                        "portfolio": portfolio,
-                        "param": param,
-                        "asset": asset,
-                        "range": range_vals,
-                        "steps": steps
-                    },
-                    "analytics": result.get("analytics", {}),
-                    "noira_analysis": {
-                        "analysis_id": f"analysis-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
-                        "messages": []
+    def run():
+        try:
+            # Imported on first use, after validation, so the simulation stack
+            # is only loaded for requests that will actually run it
+            sensitivity_test = getattr(importlib.import_module(module_name), function_name)
+            result = sensitivity_test(
+                portfolio=portfolio,
+                param=param,
+                asset=asset,
+                range_vals=range_vals,
+                steps=steps,
+                **model_options
+            )
+            logger.info(f"[{label}] Model result: {result}")
+            
+            # Auto-save test run if project_id is provided
+            if project_id:
+                try:
+                    # Save test run data in the same format as returned to frontend
+                    test_run_data = {
+                        **result,  # Include all result data at the top level
+                        "block_type": engine,
+                        "parameters": {
+                            "portfolio": portfolio,
+                            "param": param,
+                            "asset": asset,
+                            "range": range_vals,
+                            "steps": steps
+                        },
+                        "analytics": result.get("analytics", {}),
+                        "noira_analysis": {
+                            "analysis_id": f"analysis-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+                            "messages": []
+                        }
                     }
-                }
-                
-                test_run_id = file_manager.save_test_run(project_id, test_run_data)
-                result["test_run_id"] = test_run_id
-                result["saved_to_file"] = True
-                
-                # Update project with test run reference
-                project_name = data.get('project_name')
-                if project_name:
-                    file_manager.update_project_test_runs(project_name, test_run_id)
-                
-            except Exception as save_error:
-                logger.error(f"Failed to auto-save test run: {save_error}")
-                result["save_error"] = str(save_error)
-        
-        # Sanitize for JSON
-        result = sanitize_for_json(result)
-        # Add success field to indicate the test completed successfully
-        result["success"] = True
-        return jsonify(result)
-    except Exception as e:
-        logger.error(f"[QUANTUM] Exception: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+                    
+                    test_run_id = file_manager.save_test_run(project_id, test_run_data)
+                    result["test_run_id"] = test_run_id
+                    result["saved_to_file"] = True
+                    
+                    # Update project with test run reference
+                    project_name = data.get('project_name')
+                    if project_name:
+                        file_manager.update_project_test_runs(project_name, test_run_id, test_run_data)
+                    
+                except Exception as save_error:
+                    logger.error(f"Failed to auto-save test run: {save_error}")
+                    result["save_error"] = str(save_error)
+            
+            # Sanitize for JSON
+            result = sanitize_for_json(result)
+            # Add success field to indicate the test completed successfully
+            result["success"] = True
+            return result, 200
+        except Exception as e:
+            logger.error(f"[{label}] Exception: {e}")
+            return {"success": False, "error": str(e)}, 500
+    
+    return dispatch_sensitivity_request(data, run)
+
+# Original per-engine routes, kept for the frontend
+@app.route('/api/quantum_sensitivity_test', methods=['POST'])
+def quantum_sensitivity_test_api():
+    return sensitivity_test_api('quantum')
 
 @app.route('/api/classical_sensitivity_test', methods=['POST'])
 def classical_sensitivity_test_api():
-    data = request.get_json()
-    logger.info(f"[CLASSICAL] Incoming request data: {data}")
-    portfolio = data.get('portfolio')
-    param = data.get('param')
-    asset = data.get('asset')
-    range_vals = data.get('range')
-    steps = data.get('steps')
-    project_id = data.get('project_id')  # New: project_id for autosave
-    
-    # Validate portfolio
-    is_valid, error_msg = validate_portfolio(portfolio)
-    if not is_valid:
-        logger.error(f"[CLASSICAL] Portfolio validation failed: {error_msg}")
-        return jsonify({"success": False, "error": error_msg}), 400
-    
-    # Validate sensitivity parameters
-    is_valid, error_msg = validate_sensitivity_params(param, asset, range_vals, steps, portfolio)
-    if not is_valid:
-        logger.error(f"[CLASSICAL] Sensitivity param validation failed: {error_msg}")
-        return jsonify({"success": False, "error": error_msg}), 400
-    
-    try:
-        result = classical_sensitivity_test(
-            portfolio=portfolio,
-            param=param,
-            asset=asset,
-            range_vals=range_vals,
-            steps=steps
-        )
-        logger.info(f"[CLASSICAL] Model result: {result}")
-        
-        # Auto-save test run if project_id is provided
-        if project_id:
-            try:
-                # Save test run data in the same format as returned to frontend
-                test_run_data = {
-                    **result,  # Include all result data at the top level
-                    "block_type": "classical",
-                    "parameters": {
-                        "portfolio": portfolio,
-                        "param": param,
-                        "asset": asset,
-                        "range": range_vals,
-                        "steps": steps
-                    },
-                    "analytics": result.get("analytics", {}),
-                    "noira_analysis": {
-                        "analysis_id": f"analysis-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
-                        "messages": []
-                    }
-                }
-                
-                test_run_id = file_manager.save_test_run(project_id, test_run_data)
-                result["test_run_id"] = test_run_id
-                result["saved_to_file"] = True
-                
-                # Update project with test run reference
-                project_name = data.get('project_name')
-                if project_name:
-                    file_manager.update_project_test_runs(project_name, test_run_id)
-                
-            except Exception as save_error:
-                logger.error(f"Failed to auto-save test run: {save_error}")
-                result["save_error"] = str(save_error)
-        
-        # Sanitize for JSON
-        result = sanitize_for_json(result)
-        # Add success field to indicate the test completed successfully
-        result["success"] = True
-        return jsonify(result)
-    except Exception as e:
-        logger.error(f"[CLASSICAL] Exception: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    return sensitivity_test_api('classical')
 
 @app.route('/api/hybrid_sensitivity_test', methods=['POST'])
 def hybrid_sensitivity_test_api():
-    data = request.get_json()
-    logger.info(f"[HYBRID] Incoming request data: {data}")
-    portfolio = data.get('portfolio')
-    param = data.get('param')
-    asset = data.get('asset')
-    range_vals = data.get('range')
-    steps = data.get('steps')
-    project_id = data.get('project_id')  # New: project_id for autosave
+    return sensitivity_test_api('hybrid')
+
+@app.route('/api/sensitivity/jobs/<job_id>', methods=['GET'])
+def get_sensitivity_job(job_id):
+    """Poll a background sensitivity job; the result is handed out once, then forgotten"""
+    evict_expired_sensitivity_jobs()
+    future = sensitivity_jobs.get(job_id)
+    if future is None:
+        return jsonify({"success": False, "error": f"Job '{job_id}' not found"}), 404
+    if not future.done():
+        return jsonify({"success": True, "job_id": job_id, "status": "running"}), 202
     
-    # Validate portfolio
-    is_valid, error_msg = validate_portfolio(portfolio)
-    if not is_valid:
-        logger.error(f"[HYBRID] Portfolio validation failed: {error_msg}")
-        return jsonify({"success": False, "error": error_msg}), 400
-    
-    # Validate sensitivity parameters
-    is_valid, error_msg = validate_sensitivity_params(param, asset, range_vals, steps, portfolio)
-    if not is_valid:
-        logger.error(f"[HYBRID] Sensitivity param validation failed: {error_msg}")
-        return jsonify({"success": False, "error": error_msg}), 400
+    with sensitivity_jobs_lock:
+        sensitivity_jobs.pop(job_id, None)
+        sensitivity_job_expiry.pop(job_id, None)
+    payload, status = future.result()
+    return jsonify(payload), status
+
+def stream_json_array(prefix, items, suffix):
+    """
+    Yield a JSON document whose array part is encoded one item at a time.
     
-    try:
-        result = hybrid_sensitivity_test(
-            portfolio=portfolio,
-            param=param,
-            asset=asset,
-            range_vals=range_vals,
-            steps=steps
-        )
-        logger.info(f"[HYBRID] Model result: {result}")
-        
-        # Auto-save test run if project_id is provided
-        if project_id:
-            try:
-                # Save test run data in the same format as returned to frontend
-                test_run_data = {
-                    **result,  # Include all result data at the top level
-                    "block_type": "hybrid",
-                    "parameters": {
-                        "portfolio": portfolio,
-                        "param": param,
-                        "asset": asset,
-                        "range": range_vals,
-                        "steps": steps
-                    },
-                    "analytics": result.get("analytics", {}),
-                    "noira_analysis": {
-                        "analysis_id": f"analysis-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
-                        "messages": []
-                    }
-                }
-                
-                test_run_id = file_manager.save_test_run(project_id, test_run_data)
-                result["test_run_id"] = test_run_id
-                result["saved_to_file"] = True
-                
-                # Update project with test run reference
-                project_name = data.get('project_name')
-                if project_name:
-                    file_manager.update_project_test_runs(project_name, test_run_id)
-                
-            except Exception as save_error:
-                logger.error(f"Failed to auto-save test run: {save_error}")
-                result["save_error"] = str(save_error)
+    Args:
+        prefix: Encoded JSON up to (not including) the array's opening bracket
+        items: Iterable of JSON-serializable items, consumed lazily
+        suffix: Encoded JSON following the array's closing bracket
         
-        # Sanitize for JSON
-        result = sanitize_for_json(result)
-        # Add success field to indicate the test completed successfully
-        result["success"] = True
-        return jsonify(result)
-    except Exception as e:
-        logger.error(f"[HYBRID] Exception: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    Yields:
+        bytes chunks of the document
+    """
+    yield prefix + b'['
+    separator = b''
+    for item in items:
+        yield separator + orjson.dumps(item, option=OrjsonProvider.option)
+        separator = b','
+    yield b']' + suffix
+
+def conditional_get(etag, build):
+    """
+    Answer a GET with 304 when the client's If-None-Match already names this
+    version of the files behind it; otherwise build the response and tag it.
+    The browser's HTTP cache revalidates and replays the cached body to fetch().
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = app.make_response(build())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 # File Manager API Endpoints
 
@@ -616,12 +713,11 @@ def hybrid_sensitivity_test_api():
 def list_projects():
     """List all available projects"""
     try:
-        projects = file_manager.list_projects()
-        return jsonify({
+        return conditional_get(file_manager.projects_version(), lambda: jsonify({
             "success": True,
-            "projects": projects,
+            "projects": file_manager.list_projects(),
             "timestamp": datetime.now().isoformat()
-        })
+        }))
     except Exception as e:
         return jsonify({
             "success": False,
@@ -755,13 +851,25 @@ def delete_project(project_name):
 def get_project_state(project_name):
     """Get complete project state including all test runs"""
     try:
-        project_state = file_manager.get_project_state(project_name)
-        if project_state:
-            return jsonify({
-                "success": True,
-                "project_state": project_state,
-                "timestamp": datetime.now().isoformat()
-            })
+        etag = file_manager.project_state_version(project_name)
+        if etag:
+            def build():
+                project_config = file_manager.load_project(project_name)
+                if not project_config:
+                    return jsonify({
+                        "success": False,
+                        "error": "Project not found",
+                        "timestamp": datetime.now().isoformat()
+                    }), 404
+                # Stream the test runs one file at a time instead of loading and
+                # encoding every run of the project before the first byte is sent
+                prefix = (b'{"success":true,"project_state":{"project_config":'
+                          + orjson.dumps(project_config, option=OrjsonProvider.option)
+                          + b',"test_runs":')
+                test_runs = file_manager.iter_project_test_runs(project_config)
+                suffix = b'},"timestamp":' + orjson.dumps(datetime.now().isoformat()) + b'}'
+                return Response(stream_json_array(prefix, test_runs, suffix), mimetype='application/json')
+            return conditional_get(etag, build)
         else:
             return jsonify({
                 "success": False,
@@ -779,19 +887,30 @@ def get_project_state(project_name):
 def get_project_last_modified(project_name):
     """Get the last modified timestamp of a project"""
     try:
-        project_config = file_manager.load_project(project_name)
-        if not project_config:
+        # Polled every second: an unchanged .ksm is answered with a 304
+        # without reading or encoding the project
+        etag = file_manager.project_version(project_name)
+        if not etag:
             return jsonify({
                 "success": False,
                 "error": "Project not found",
                 "timestamp": datetime.now().isoformat()
             }), 404
         
-        return jsonify({
-            "success": True,
-            "last_modified": project_config.get("metadata", {}).get("last_modified"),
-            "timestamp": datetime.now().isoformat()
-        })
+        def build():
+            project_config = file_manager.load_project(project_name)
+            if not project_config:
+                return jsonify({
+                    "success": False,
+                    "error": "Project not found",
+                    "timestamp": datetime.now().isoformat()
+                }), 404
+            return jsonify({
+                "success": True,
+                "last_modified": project_config.get("metadata", {}).get("last_modified"),
+                "timestamp": datetime.now().isoformat()
+            })
+        return conditional_get(etag, build)
     except Exception as e:
         return jsonify({
             "success": False,
@@ -841,12 +960,11 @@ def list_test_runs():
     try:
         # Suppress logs for polling requests (they don't have project_id)
         suppress_logs = project_id is None
-        test_runs = file_manager.list_test_runs(project_id, suppress_logs=suppress_logs)
-        return jsonify({
+        return conditional_get(file_manager.test_runs_version(), lambda: jsonify({
             "success": True,
-            "test_runs": test_runs,
+            "test_runs": file_manager.list_test_runs(project_id, suppress_logs=suppress_logs),
             "timestamp": datetime.now().isoformat()
-        })
+        }))
     except Exception as e:
         return jsonify({
             "success": False,
@@ -858,13 +976,22 @@ def list_test_runs():
 def get_test_run(test_run_id):
     """Get a specific test run"""
     try:
-        test_run_data = file_manager.load_test_run(test_run_id)
-        if test_run_data:
-            return jsonify({
-                "success": True,
-                "test_run": test_run_data,
-                "timestamp": datetime.now().isoformat()
-            })
+        etag = file_manager.test_run_version(test_run_id)
+        if etag:
+            def build():
+                test_run_data = file_manager.load_test_run(test_run_id)
+                if not test_run_data:
+                    return jsonify({
+                        "success": False,
+                        "error": "Test run not found",
+                        "timestamp": datetime.now().isoformat()
+                    }), 404
+                return jsonify({
+                    "success": True,
+                    "test_run": test_run_data,
+                    "timestamp": datetime.now().isoformat()
+                })
+            return conditional_get(etag, build)
         else:
             return jsonify({
                 "success": False,
@@ -944,37 +1071,52 @@ def autosave_project(project_name):
         }), 400
     
     try:
-        # Load existing project configuration
-        project_config = file_manager.load_project(project_name)
-        if not project_config:
+        # Re-sending the state that was last saved, with the project untouched
+        # since, would only bump last_modified and make open clients reload
+        body_digest = hashlib.blake2b(request.get_data(), digest_size=16).digest()
+        if last_autosaves.get(project_name) == (body_digest, file_manager.project_version(project_name)):
             return jsonify({
-                "success": False,
-                "error": "Project not found",
+                "success": True,
+                "message": "Project already up to date",
                 "timestamp": datetime.now().isoformat()
-            }), 404
+            })
         
-        # Debug: Log what blocks are being received
-        if 'blocks' in project_state:
-            print(f"Autosave for {project_name} - Received blocks:")
-            for block_type, block_data in project_state['blocks'].items():
+        # Hold the project lock across load/merge/save so a background
+        # sensitivity job recording a test run is not overwritten
+        with file_manager.project_lock:
+            # Load existing project configuration
+            project_config = file_manager.load_project(project_name)
+            if not project_config:
+                return jsonify({
+                    "success": False,
+                    "error": "Project not found",
+                    "timestamp": datetime.now().isoformat()
+                }), 404
+            
+            # Debug: Log what blocks are being received
+            if 'blocks' in project_state:
+                print(f"Autosave for {project_name} - Received blocks:")
+                for block_type, block_data in project_state['blocks'].items():
+                    print(f"  {block_type}: placed={block_data.get('placed')}, position={block_data.get('position')}, has_params={block_data.get('parameters') is not None}")
+            
+            # Merge the state into the configuration
+            if 'blocks' in project_state:
+                project_config['configuration']['blocks'] = project_state['blocks']
+            if 'ui_state' in project_state:
+                project_config['configuration']['ui_state'] = project_state['ui_state']
+            # For results, only update current_tab to avoid overwriting test_runs
+            if 'results' in project_state and 'current_tab' in project_state['results']:
+                project_config['results']['current_tab'] = project_state['results']['current_tab']
+            
+            # Debug: Log what blocks are being saved
+            print(f"Autosave for {project_name} - Saving blocks:")
+            for block_type, block_data in project_config['configuration']['blocks'].items():
                 print(f"  {block_type}: placed={block_data.get('placed')}, position={block_data.get('position')}, has_params={block_data.get('parameters') is not None}")
-        
-        # Merge the state into the configuration
-        if 'blocks' in project_state:
-            project_config['configuration']['blocks'] = project_state['blocks']
-        if 'ui_state' in project_state:
-            project_config['configuration']['ui_state'] = project_state['ui_state']
-        # For results, only update current_tab to avoid overwriting test_runs
-        if 'results' in project_state and 'current_tab' in project_state['results']:
-            project_config['results']['current_tab'] = project_state['results']['current_tab']
-        
-        # Debug: Log what blocks are being saved
-        print(f"Autosave for {project_name} - Saving blocks:")
-        for block_type, block_data in project_config['configuration']['blocks'].items():
-            print(f"  {block_type}: placed={block_data.get('placed')}, position={block_data.get('position')}, has_params={block_data.get('parameters') is not None}")
-        
-        # Save the updated configuration
-        success = file_manager.save_project(project_name, project_config)
+            
+            # Save the updated configuration
+            success = file_manager.save_project(project_name, project_config)
+            if success:
+                last_autosaves[project_name] = (body_digest, file_manager.project_version(project_name))
         if success:
             return jsonify({
                 "success": True,
@@ -1136,40 +1278,49 @@ def check_correlation_validity_api():
         print(f"[DEBUG] Error during correlation validity check: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Request lines of polled endpoints as werkzeug logs them ("GET /path HTTP/1.1").
+# The trailing space matches only the bare path, so requests with a query
+# string (e.g. /api/test-runs?project_id=...) are still logged.
+POLLING_REQUEST_PREFIXES = (
+    'GET /api/projects ',  # Project list polling
+    'GET /api/projects/',  # Project details and last-modified polling
+    'GET /api/test-runs ',  # Test run list polling
+)
+
+def is_polling_access_log(record):
+    """Check a werkzeug access-log record against the polled endpoints.
+
+    Werkzeug logs '"%s" %s %s' with the request line and status code as the
+    first arguments, so they are matched directly instead of formatting the
+    message. Failed polls are still logged.
+    """
+    args = record.args
+    if not isinstance(args, tuple) or len(args) < 2 or args[1] not in ('200', '304'):
+        return False
+    line = args[0]
+    # 304 request lines are wrapped in ANSI colour codes
+    while line.startswith('\x1b['):
+        line = line[line.index('m') + 1:]
+    return line.startswith(POLLING_REQUEST_PREFIXES)
+
 class NoPollingRequestFilter(logging.Filter):
     """Filter out frequent polling requests from Flask logs"""
     
     def filter(self, record):
-        # Filter out GET requests to polling endpoints
-        if hasattr(record, 'getMessage'):
-            message = record.getMessage()
-            if ('GET /api/chat/display-updates' in message or 
-                'GET /api/chat/thinking-status' in message):
-                return False
-        return True
+        return not is_polling_access_log(record)
 
 class WerkzeugFilter(logging.Filter):
     """Filter out polling endpoint logs from werkzeug"""
     def filter(self, record):
-        # Check if this is a werkzeug access log
-        if record.name == 'werkzeug' and hasattr(record, 'args'):
-            # Convert args to string to check the message content
-            message = str(record.getMessage())
-            # Filter out polling endpoints
-            if any(endpoint in message for endpoint in [
-                '"GET /api/projects HTTP',
-                '"GET /api/projects/',
-                '/last-modified HTTP',
-                '/thinking-status HTTP',
-                '"GET /api/test-runs HTTP'
-            ]):
-                return False
-        return True
+        return record.name != 'werkzeug' or not is_polling_access_log(record)
 
 if __name__ == '__main__':
     # Add filter to werkzeug logger
     werkzeug_logger = logging.getLogger('werkzeug')
     werkzeug_logger.addFilter(WerkzeugFilter())
     
-    # Run the app
-    app.run(debug=True, port=5001)
+    # Run the Werkzeug development server. It runs with the debugger and
+    # reloader unless FLASK_DEBUG is set to 0/false/no; to serve real
+    # workloads use gunicorn instead (see README).
+    debug = os.environ.get('FLASK_DEBUG', '1').lower() not in ('0', 'false', 'no')
+    app.run(host='127.0.0.1', port=5001, debug=debug)
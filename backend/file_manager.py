@@ -5,16 +5,41 @@ File management module for KANOSYM project files (.ksm) and test run output file
 Handles reading, writing, and managing project state and test results.
 """
 
+import hashlib
 import json
 import os
+import threading
 import uuid
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _summarize_project(project_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing fields of a .ksm project file (the name comes from its folder)"""
+    metadata = project_config["metadata"]
+    return {
+        "project_id": metadata["project_id"],
+        "created": metadata["created"],
+        "last_modified": metadata["last_modified"],
+        "description": metadata["description"]
+    }
+
+
+def _summarize_test_run(test_run_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing fields of a test run output file"""
+    return {
+        "test_run_id": test_run_data["test_run_id"],
+        "project_id": test_run_data.get("project_id"),
+        "timestamp": test_run_data["timestamp"],
+        "block_type": test_run_data["block_type"],
+        "parameters": test_run_data["parameters"]
+    }
+
+
 class FileManager:
     """Manages .ksm project files and test run output files"""
     
@@ -39,6 +64,15 @@ class FileManager:
         self.projects_dir.mkdir(exist_ok=True)
         self.test_runs_dir.mkdir(exist_ok=True)
         
+        # Listing summaries keyed by file path -> ((st_mtime_ns, st_size), summary),
+        # so polled listings only re-parse files that actually changed
+        self._project_summaries: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._test_run_summaries: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        
+        # Serializes read-modify-write updates of .ksm files between request
+        # threads and background sensitivity jobs
+        self.project_lock = threading.RLock()
+        
         logger.info(f"FileManager initialized with base_dir: {self.base_dir}")
         logger.info(f"Projects directory: {self.projects_dir}")
         logger.info(f"Test runs directory: {self.test_runs_dir}")
@@ -186,24 +220,20 @@ class FileManager:
             List of project metadata dictionaries
         """
         projects = []
+        seen = set()
         try:
             for project_folder in self.projects_dir.iterdir():
                 if project_folder.is_dir():
                     ksm_file = project_folder / f"{project_folder.name}.ksm"
                     if ksm_file.exists():
                         try:
-                            with open(ksm_file, 'r') as f:
-                                project_config = json.load(f)
-                            projects.append({
-                                "name": project_folder.name,
-                                "project_id": project_config["metadata"]["project_id"],
-                                "created": project_config["metadata"]["created"],
-                                "last_modified": project_config["metadata"]["last_modified"],
-                                "description": project_config["metadata"]["description"]
-                            })
+                            summary = self._read_summary(ksm_file, self._project_summaries, _summarize_project)
+                            seen.add(str(ksm_file))
+                            projects.append({"name": project_folder.name, **summary})
                         except Exception as e:
                             logger.error(f"Failed to read project file {ksm_file}: {e}")
                             continue
+            self._prune_summaries(self._project_summaries, seen)
             logger.debug(f"Found {len(projects)} projects")
             return projects
         except Exception as e:
@@ -335,29 +365,26 @@ class FileManager:
             List of test run metadata dictionaries
         """
         test_runs = []
+        seen = set()
         
         try:
             for filepath in self.test_runs_dir.glob("*.json"):
                 try:
-                    with open(filepath, 'r') as f:
-                        test_run_data = json.load(f)
+                    summary = self._read_summary(filepath, self._test_run_summaries, _summarize_test_run)
+                    seen.add(str(filepath))
                     
                     # Filter by project if specified
-                    if project_id and test_run_data.get("project_id") != project_id:
+                    if project_id and summary["project_id"] != project_id:
                         continue
                     
-                    test_runs.append({
-                        "test_run_id": test_run_data["test_run_id"],
-                        "project_id": test_run_data.get("project_id"),
-                        "timestamp": test_run_data["timestamp"],
-                        "block_type": test_run_data["block_type"],
-                        "parameters": test_run_data["parameters"]
-                    })
+                    test_runs.append(summary)
                     
                 except Exception as e:
                     logger.error(f"Failed to read test run file {filepath}: {e}")
                     continue
             
+            self._prune_summaries(self._test_run_summaries, seen)
+            
             # Sort by timestamp (newest first)
             test_runs.sort(key=lambda x: x["timestamp"], reverse=True)
             
@@ -369,40 +396,148 @@ class FileManager:
             logger.error(f"Failed to list test runs: {e}")
             return []
     
-    def update_project_test_runs(self, project_name: str, test_run_id: str) -> bool:
+    def _read_summary(self, filepath: Path, cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]], summarize) -> Dict[str, Any]:
         """
-        Update a project's test runs list with a new test run.
+        Summarize a JSON file, re-reading it only when its mtime or size changed.
         
         Args:
-            project_name: Name of the project
-            test_run_id: ID of the test run to add
+            filepath: File to summarize
+            cache: Summary cache for this kind of file
+            summarize: Builds the listing summary from the parsed file
             
         Returns:
-            True if successful, False otherwise
+            Summary dictionary (shared with the cache; do not mutate)
         """
-        project_config = self.load_project(project_name)
-        if not project_config:
-            return False
+        stat = filepath.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = str(filepath)
+        cached = cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
         
-        # Load the test run data to get block_type and parameters
-        test_run_data = self.load_test_run(test_run_id)
-        if not test_run_data:
-            logger.error(f"Could not load test run {test_run_id} to update project")
-            return False
+        with open(filepath, 'r') as f:
+            summary = summarize(json.load(f))
+        cache[key] = (signature, summary)
+        return summary
+    
+    @staticmethod
+    def _files_version(paths) -> str:
+        """
+        Version tag derived from the name, mtime and size of each existing file.
         
-        # Add test run to project's test runs list
-        test_run_info = {
-            "id": test_run_id,
-            "timestamp": datetime.now().isoformat(),
-            "block_type": test_run_data.get("block_type", "classical"),
-            "parameters": test_run_data.get("parameters", {}),
-            "results_file": f"test-runs/{test_run_id}.json"
-        }
+        Args:
+            paths: Files whose contents make up a response
+            
+        Returns:
+            Hex digest that changes whenever any of the files changes
+        """
+        digest = hashlib.blake2b(digest_size=12)
+        for path in sorted(paths):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            digest.update(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+        return digest.hexdigest()
+    
+    def projects_version(self) -> str:
+        """Version tag of the project listing"""
+        return self._files_version(self.projects_dir.glob("*/*.ksm"))
+    
+    def project_version(self, name: str) -> Optional[str]:
+        """
+        Version tag of a project's .ksm file.
         
-        project_config["results"]["test_runs"].append(test_run_info)
-        project_config["results"]["current_tab"] = test_run_id
+        Args:
+            name: Project name (without .ksm extension)
+            
+        Returns:
+            Version tag or None if the project does not exist
+        """
+        filepath = self.projects_dir / name / f"{name}.ksm"
+        if not filepath.exists():
+            return None
+        return self._files_version([filepath])
+    
+    def project_state_version(self, name: str) -> Optional[str]:
+        """
+        Version tag of a project's state (its .ksm file plus the test runs).
         
-        return self.save_project(project_name, project_config)
+        Args:
+            name: Project name (without .ksm extension)
+            
+        Returns:
+            Version tag or None if the project does not exist
+        """
+        filepath = self.projects_dir / name / f"{name}.ksm"
+        if not filepath.exists():
+            return None
+        return self._files_version([filepath, *self.test_runs_dir.glob("*.json")])
+    
+    def test_runs_version(self) -> str:
+        """Version tag of the test run listing"""
+        return self._files_version(self.test_runs_dir.glob("*.json"))
+    
+    def test_run_version(self, test_run_id: str) -> Optional[str]:
+        """
+        Version tag of a single test run.
+        
+        Args:
+            test_run_id: ID of the test run
+            
+        Returns:
+            Version tag or None if the test run does not exist
+        """
+        filepath = self.test_runs_dir / f"{test_run_id}.json"
+        if not filepath.exists():
+            return None
+        return self._files_version([filepath])
+    
+    @staticmethod
+    def _prune_summaries(cache: Dict[str, Any], seen: set) -> None:
+        """Drop cached summaries of files that no longer exist"""
+        for key in cache.keys() - seen:
+            cache.pop(key, None)
+    
+    def update_project_test_runs(self, project_name: str, test_run_id: str,
+                                 test_run_data: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Update a project's test runs list with a new test run.
+        
+        Args:
+            project_name: Name of the project
+            test_run_id: ID of the test run to add
+            test_run_data: Test run data just saved, if the caller still has it
+                (saves re-reading the test run file)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        with self.project_lock:
+            project_config = self.load_project(project_name)
+            if not project_config:
+                return False
+            
+            # Load the test run data to get block_type and parameters
+            if test_run_data is None:
+                test_run_data = self.load_test_run(test_run_id)
+            if not test_run_data:
+                logger.error(f"Could not load test run {test_run_id} to update project")
+                return False
+            
+            # Add test run to project's test runs list
+            test_run_info = {
+                "id": test_run_id,
+                "timestamp": datetime.now().isoformat(),
+                "block_type": test_run_data.get("block_type", "classical"),
+                "parameters": test_run_data.get("parameters", {}),
+                "results_file": f"test-runs/{test_run_id}.json"
+            }
+            
+            project_config["results"]["test_runs"].append(test_run_info)
+            project_config["results"]["current_tab"] = test_run_id
+            
+            return self.save_project(project_name, project_config)
     
     def get_project_state(self, project_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -418,22 +553,30 @@ class FileManager:
         if not project_config:
             return None
         
-        # Load all test runs for this project
-        test_runs = []
-        for test_run_info in project_config["results"]["test_runs"]:
-            test_run_id = test_run_info["id"]
-            test_run_data = self.load_test_run(test_run_id)
-            if test_run_data:
-                test_runs.append(test_run_data)
-        
         # Create complete state
         project_state = {
             "project_config": project_config,
-            "test_runs": test_runs
+            "test_runs": list(self.iter_project_test_runs(project_config))
         }
         
         return project_state
     
+    def iter_project_test_runs(self, project_config: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily load the test runs referenced by a project, one file at a time.
+        
+        The referenced ids are read up front, so a malformed project raises here
+        rather than part-way through a streamed response.
+        
+        Args:
+            project_config: Loaded project configuration
+            
+        Returns:
+            Iterator over the data of each referenced run that could be loaded
+        """
+        test_run_ids = [test_run_info["id"] for test_run_info in project_config["results"]["test_runs"]]
+        return (test_run_data for test_run_data in map(self.load_test_run, test_run_ids) if test_run_data)
+    
     def save_project_state(self, project_name: str, project_state: Dict[str, Any]) -> bool:
         """
         Save the complete state of a project.
@@ -10,12 +10,24 @@ Available blocks:
 - hybrid: Classical-quantum hybrid approach for portfolio analysis
 """
 
-from .quantum.quantum_sensitivity import quantum_sensitivity_test
-from .classical.classical_sensitivity import classical_sensitivity_test
-from .hybrid.hybrid_sensitivity import hybrid_sensitivity_test
+import importlib
+
+# Blocks are imported on first attribute access, so importing one block (e.g.
+# model_blocks.classical) does not pull in the others and their dependencies
+_BLOCK_MODULES = {
+    'quantum_sensitivity_test': '.quantum.quantum_sensitivity',
+    'classical_sensitivity_test': '.classical.classical_sensitivity',
+    'hybrid_sensitivity_test': '.hybrid.hybrid_sensitivity',
+}
 
 __all__ = [
     'quantum_sensitivity_test',
     'classical_sensitivity_test', 
     'hybrid_sensitivity_test'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _BLOCK_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_BLOCK_MODULES[name], __name__), name)
@@ -94,22 +94,22 @@ def perturb_portfolio(
     values = np.linspace(range_vals[0], range_vals[1], steps)
     logger.info(f"perturb_portfolio: Generated values: {values}")
     
+    # Index of the perturbed asset, resolved once rather than per step
+    idx = portfolio['assets'].index(asset)
+    
     for i, val in enumerate(values):
         logger.info(f"perturb_portfolio: Processing value {i+1}/{len(values)}: {val}")
         p = {**portfolio}
         try:
             if param == 'volatility':
-                idx = portfolio['assets'].index(asset)
                 logger.info(f"perturb_portfolio: Volatility perturbation - asset={asset}, idx={idx}")
                 p['volatility'] = list(portfolio['volatility'])
                 p['volatility'][idx] = val
             elif param == 'weight':
-                idx = portfolio['assets'].index(asset)
                 logger.info(f"perturb_portfolio: Weight perturbation - asset={asset}, idx={idx}")
                 p['weights'] = list(portfolio['weights'])
                 p['weights'][idx] = val
             elif param == 'correlation':
-                idx = portfolio['assets'].index(asset)
                 logger.info(f"perturb_portfolio: Correlation perturbation - asset={asset}, idx={idx}")
                 logger.info(f"perturb_portfolio: Matrix shape: {len(portfolio['correlation_matrix'])}x{len(portfolio['correlation_matrix'][0]) if portfolio['correlation_matrix'] else 0}")
                 p['correlation_matrix'] = [row[:] for row in portfolio['correlation_matrix']]
@@ -185,7 +185,7 @@ def hybrid_sensitivity_test(
     Returns:
         Dict[str, Any]: Sensitivity analysis results and analytics.
     """
-    analytics = AnalyticsCollector('hybrid')
+    analytics = AnalyticsCollector('hybrid', expected_steps=steps)
     analytics.start_collection()
     logger.info(f"Starting hybrid sensitivity analysis: {param} for {asset}")
 
@@ -46,22 +46,22 @@ def perturb_portfolio(param: str, asset: str, range_vals: List[float], steps: in
     perturbed = []
     values = np.linspace(range_vals[0], range_vals[1], steps)
     
+    # Index of the perturbed asset, resolved once rather than per step
+    idx = portfolio['assets'].index(asset)
+    
     for val in values:
         p = {**portfolio}
         
         if param == 'volatility':
-            idx = portfolio['assets'].index(asset)
             p['volatility'] = list(portfolio['volatility'])
             p['volatility'][idx] = val
             
         elif param == 'weight':
-            idx = portfolio['assets'].index(asset)
             p['weights'] = list(portfolio['weights'])
             p['weights'][idx] = val
             # Optionally re-normalize weights here
             
         elif param == 'correlation':
-            idx = portfolio['assets'].index(asset)
             p['correlation_matrix'] = [row[:] for row in portfolio['correlation_matrix']]
             for j in range(len(p['correlation_matrix'])):
                 if idx != j:  # Dont change diagonal (always 1)
@@ -192,7 +192,7 @@ def quantum_sensitivity_test(
     """
     Main function for quantum sensitivity testing (volatility only).
     """
-    analytics = AnalyticsCollector('quantum')
+    analytics = AnalyticsCollector('quantum', expected_steps=steps)
     analytics.start_collection()
     logger.info(f"Starting quantum sensitivity analysis: {param} for {asset}")
 
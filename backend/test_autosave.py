@@ -9,6 +9,7 @@ import os
 import requests
 import json
 import time
+import tempfile
 sys.path.append(os.path.dirname(__file__))
 
 def test_autosave_functionality():
@@ -156,5 +157,47 @@ def test_autosave_functionality():
     print("   ✅ File persistence verification")
     print("   ✅ Error handling and validation")
 
+def make_test_client():
+    """Flask test client for api.py backed by a throwaway projects directory."""
+    import api
+    from file_manager import FileManager
+    api.file_manager = FileManager(tempfile.mkdtemp())
+    return api, api.app.test_client()
+
+def test_autosave_skips_unchanged_state():
+    """A repeated identical autosave must not rewrite the project."""
+    print("\nTesting autosave deduplication...")
+    api, client = make_test_client()
+    api.file_manager.create_project("Dedup Project")
+    
+    def last_modified():
+        return api.file_manager.load_project("Dedup Project")["metadata"]["last_modified"]
+    
+    body = {"project_state": {"ui_state": {"current_block_mode": "classical", "selected_block": None, "block_move_count": 1}}}
+    response = client.post("/api/projects/Dedup Project/autosave", json=body)
+    assert response.status_code == 200 and response.get_json()["success"]
+    first_saved = last_modified()
+    
+    time.sleep(0.01)
+    response = client.post("/api/projects/Dedup Project/autosave", json=body)
+    assert response.status_code == 200 and response.get_json()["success"]
+    assert last_modified() == first_saved
+    print("✅ Identical autosave left last_modified unchanged")
+    
+    body["project_state"]["ui_state"]["block_move_count"] = 2
+    client.post("/api/projects/Dedup Project/autosave", json=body)
+    assert last_modified() != first_saved
+    print("✅ Changed autosave was written")
+    
+    # Another writer changes the project; the same autosave body must be
+    # written again rather than answered from the dedup table
+    project_config = api.file_manager.load_project("Dedup Project")
+    project_config["configuration"]["ui_state"]["block_move_count"] = 7
+    api.file_manager.save_project("Dedup Project", project_config)
+    client.post("/api/projects/Dedup Project/autosave", json=body)
+    assert api.file_manager.load_project("Dedup Project")["configuration"]["ui_state"]["block_move_count"] == 2
+    print("✅ Identical autosave written again after an outside change")
+
 if __name__ == "__main__":
-    test_autosave_functionality() 
\ No newline at end of file
+    test_autosave_functionality()
+    test_autosave_skips_unchanged_state() 
\ No newline at end of file
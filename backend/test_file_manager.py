@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(__file__))
 
 from file_manager import FileManager
 import json
+import tempfile
 
 def test_file_manager():
     """Test the file manager functionality."""
@@ -226,5 +227,38 @@ def test_file_manager():
     print(f"   Test runs directory: {file_manager.test_runs_dir}")
     print("\nYou can inspect the generated .ksm and .json files to see the structure.")
 
+def test_listing_cache_refresh():
+    """Test that cached listing summaries follow rewritten files."""
+    
+    print("\nTesting listing cache refresh...")
+    file_manager = FileManager(tempfile.mkdtemp())
+    
+    project_config = file_manager.create_project("Cache Project")
+    project_id = project_config['metadata']['project_id']
+    test_run_id = file_manager.save_test_run(project_id, {"block_type": "classical", "parameters": {"steps": 5}})
+    
+    # Prime the caches
+    assert file_manager.list_projects()[0]['description'] != "Rewritten"
+    assert file_manager.list_test_runs()[0]['parameters'] == {"steps": 5}
+    
+    # Rewrite both files behind the cache
+    project_config['metadata']['description'] = "Rewritten"
+    file_manager.save_project("Cache Project", project_config)
+    test_run_data = file_manager.load_test_run(test_run_id)
+    test_run_data['parameters'] = {"steps": 10}
+    with open(file_manager.test_runs_dir / f"{test_run_id}.json", 'w') as f:
+        json.dump(test_run_data, f, indent=2)
+    
+    assert file_manager.list_projects()[0]['description'] == "Rewritten"
+    assert file_manager.list_test_runs()[0]['parameters'] == {"steps": 10}
+    print("✅ Listings reflect rewritten project and test run files")
+    
+    # Deleted files drop out of the listing and the cache
+    file_manager.delete_test_run(test_run_id)
+    assert file_manager.list_test_runs() == []
+    assert not file_manager._test_run_summaries
+    print("✅ Deleted test run removed from listing cache")
+
 if __name__ == "__main__":
-    test_file_manager() 
\ No newline at end of file
+    test_file_manager()
+    test_listing_cache_refresh() 
\ No newline at end of file
@@ -154,6 +154,37 @@ def test_invalid_portfolios():
     except Exception as e:
         print(f"❌ Too many assets validation - EXCEPTION: {str(e)}")
 
+def test_malformed_portfolios():
+    """Test portfolios that are not JSON objects or hold non-numeric values."""
+    print("\n=== Testing Malformed Portfolios ===")
+    
+    nan_weights = create_test_portfolio(2)
+    nan_weights["weights"] = ["nan", "nan"]
+    inf_volatility = create_test_portfolio(2)
+    inf_volatility["volatility"] = ["inf", 0.18]
+    
+    for name, portfolio in [("String portfolio", "abc"), ("List portfolio", [1, 2]),
+                            ("NaN weights", nan_weights), ("Infinite volatility", inf_volatility)]:
+        test_data = {
+            "portfolio": portfolio,
+            "param": "volatility",
+            "asset": "AAPL",
+            "range": [0.15, 0.25],
+            "steps": 5
+        }
+        
+        try:
+            response = requests.post(f"{BASE_URL}/api/classical_sensitivity_test", 
+                                   json=test_data, timeout=10)
+            if response.status_code == 400:
+                error_data = response.json()
+                print(f"✅ {name} validation - SUCCESS")
+                print(f"   Error: {error_data.get('error', 'Unknown error')}")
+            else:
+                print(f"❌ {name} validation - FAILED (expected 400, got {response.status_code})")
+        except Exception as e:
+            print(f"❌ {name} validation - EXCEPTION: {str(e)}")
+
 def main():
     """Run all tests."""
     print("🧪 Testing Modal Functionality with Dynamic Asset Management")
@@ -166,6 +197,7 @@ def main():
     
     # Test invalid portfolios
     test_invalid_portfolios()
+    test_malformed_portfolios()
     
     print("\n" + "=" * 60)
     print("✅ Testing completed!")
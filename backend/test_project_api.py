@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the project and test run API endpoints.
+Runs against the Flask test client, so no server needs to be running.
+"""
+
+import sys
+import os
+import io
+import json
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+def make_test_client():
+    """Flask test client for api.py backed by a throwaway projects directory."""
+    import api
+    from file_manager import FileManager
+    api.file_manager = FileManager(tempfile.mkdtemp())
+    return api, api.app.test_client()
+
+def test_streamed_project_state():
+    """The streamed project state parses to the same structure as before."""
+    print("\nTesting streamed project state...")
+    api, client = make_test_client()
+    project_config = api.file_manager.create_project("Stream Project")
+    test_run_id = api.file_manager.save_test_run(
+        project_config["metadata"]["project_id"], {"block_type": "hybrid", "parameters": {"steps": 3}})
+    api.file_manager.update_project_test_runs("Stream Project", test_run_id)
+    
+    response = client.get("/api/projects/Stream Project/state")
+    assert response.status_code == 200
+    data = json.loads(response.get_data())
+    assert data["success"] is True and "timestamp" in data
+    assert data["project_state"] == api.file_manager.get_project_state("Stream Project")
+    assert [run["test_run_id"] for run in data["project_state"]["test_runs"]] == [test_run_id]
+    print("✅ Streamed body matches FileManager.get_project_state()")
+
+def test_unreadable_project_state():
+    """A project file that exists but cannot be loaded is a 404, not a 500."""
+    print("\nTesting unreadable project state...")
+    api, client = make_test_client()
+    api.file_manager.create_project("Broken Project")
+    with open(api.file_manager.projects_dir / "Broken Project" / "Broken Project.ksm", "w") as f:
+        f.write("{not json")
+    
+    response = client.get("/api/projects/Broken Project/state")
+    assert response.status_code == 404 and response.get_json()["error"] == "Project not found"
+    assert "ETag" not in response.headers
+    print("✅ Unreadable project state answered with 404")
+
+def test_json_body_limits():
+    """Oversized and chunked JSON bodies are refused before they are parsed."""
+    print("\nTesting JSON body limits...")
+    api, client = make_test_client()
+    headers = {"Content-Type": "application/json"}
+    
+    response = client.post("/api/projects", data=b" " * (api.MAX_JSON_BODY_BYTES + 1), headers=headers)
+    assert response.status_code == 413 and response.get_json()["success"] is False
+    print("✅ Oversized JSON body rejected with 413")
+    
+    response = client.post("/api/projects", input_stream=io.BytesIO(b'{"name": "Chunked Project"}'),
+                           headers={**headers, "Transfer-Encoding": "chunked"})
+    assert response.status_code == 411 and response.get_json()["success"] is False
+    assert api.file_manager.load_project("Chunked Project") is None
+    print("✅ Chunked JSON body rejected with 411")
+
+def test_conditional_gets():
+    """Project state and test run GETs answer 304 until the file changes."""
+    print("\nTesting ETag revalidation...")
+    api, client = make_test_client()
+    project_config = api.file_manager.create_project("ETag Project")
+    test_run_id = api.file_manager.save_test_run(
+        project_config["metadata"]["project_id"], {"block_type": "classical", "parameters": {}})
+    
+    for url in ("/api/projects/ETag Project/state", f"/api/test-runs/{test_run_id}"):
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304 and response.get_data() == b""
+        print(f"✅ {url}: 200, then 304 for the same ETag")
+        
+        # Change the file behind the endpoint
+        if url.startswith("/api/projects/"):
+            project_config["metadata"]["description"] = "Changed"
+            api.file_manager.save_project("ETag Project", project_config)
+        else:
+            test_run_data = api.file_manager.load_test_run(test_run_id)
+            test_run_data["parameters"] = {"changed": True}
+            with open(api.file_manager.test_runs_dir / f"{test_run_id}.json", "w") as f:
+                json.dump(test_run_data, f)
+        
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.headers["ETag"] != etag
+        print(f"✅ {url}: 200 again after the file changed")
+    
+    assert client.get("/api/test-runs/missing-run").status_code == 404
+
+def test_unreadable_files():
+    """Test runs and last-modified polls of unloadable files are a 404, not a 500."""
+    print("\nTesting unreadable test run and project files...")
+    api, client = make_test_client()
+    project_config = api.file_manager.create_project("Broken Project")
+    test_run_id = api.file_manager.save_test_run(
+        project_config["metadata"]["project_id"], {"block_type": "classical", "parameters": {}})
+    with open(api.file_manager.test_runs_dir / f"{test_run_id}.json", "w") as f:
+        f.write("{not json")
+    with open(api.file_manager.projects_dir / "Broken Project" / "Broken Project.ksm", "w") as f:
+        f.write("{not json")
+    
+    for url, error in ((f"/api/test-runs/{test_run_id}", "Test run not found"),
+                       ("/api/projects/Broken Project/last-modified", "Project not found")):
+        response = client.get(url)
+        assert response.status_code == 404 and response.get_json()["error"] == error
+        assert "ETag" not in response.headers
+        print(f"✅ {url}: unreadable file answered with 404")
+
+if __name__ == "__main__":
+    test_streamed_project_state()
+    test_unreadable_project_state()
+    test_json_body_limits()
+    test_conditional_gets()
+    test_unreadable_files()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the sensitivity API endpoints.
+Runs requests in-process through Flask's test client, no server needed.
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+TEST_PORTFOLIO_REQUEST = {
+    "portfolio": {
+        "assets": ["AAPL", "GOOGL"],
+        "weights": [0.6, 0.4],
+        "volatility": [0.2, 0.25],
+        "correlation_matrix": [[1.0, 0.3], [0.3, 1.0]]
+    },
+    "param": "volatility",
+    "asset": "AAPL",
+    "range": [0.15, 0.25],
+    "steps": 2
+}
+
+def make_test_client():
+    """Flask test client for api.py backed by a throwaway projects directory."""
+    import api
+    from file_manager import FileManager
+    api.file_manager = FileManager(tempfile.mkdtemp())
+    return api, api.app.test_client()
+
+def test_sensitivity_job_lifecycle():
+    """Async sensitivity jobs go 202 -> 200 -> 404."""
+    print("\nTesting async sensitivity jobs...")
+    api, client = make_test_client()
+    
+    response = client.post("/api/sensitivity/classical", json={**TEST_PORTFOLIO_REQUEST, "async": True})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    assert response.headers["Location"] == f"/api/sensitivity/jobs/{job_id}"
+    print(f"✅ Job queued: {job_id}")
+    
+    deadline = time.time() + 120
+    response = client.get(f"/api/sensitivity/jobs/{job_id}")
+    while response.status_code == 202 and time.time() < deadline:
+        time.sleep(0.2)
+        response = client.get(f"/api/sensitivity/jobs/{job_id}")
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["success"] and len(result["results"]) == TEST_PORTFOLIO_REQUEST["steps"]
+    print("✅ Job result returned once finished")
+    
+    assert client.get(f"/api/sensitivity/jobs/{job_id}").status_code == 404
+    print("✅ Collected job is forgotten")
+
+def test_sensitivity_job_expiry():
+    """Finished jobs nobody polls are evicted after the TTL."""
+    print("\nTesting async sensitivity job expiry...")
+    api, client = make_test_client()
+    ttl = api.SENSITIVITY_JOB_TTL_SECONDS
+    api.SENSITIVITY_JOB_TTL_SECONDS = 0
+    try:
+        response = client.post("/api/sensitivity/classical", json={**TEST_PORTFOLIO_REQUEST, "async": True})
+        job_id = response.get_json()["job_id"]
+        api.sensitivity_jobs[job_id].result(timeout=120)
+        
+        deadline = time.time() + 5
+        while job_id not in api.sensitivity_job_expiry and time.time() < deadline:
+            time.sleep(0.05)
+        assert client.get(f"/api/sensitivity/jobs/{job_id}").status_code == 404
+        assert job_id not in api.sensitivity_jobs and job_id not in api.sensitivity_job_expiry
+        print("✅ Unpolled job evicted with its result")
+    finally:
+        api.SENSITIVITY_JOB_TTL_SECONDS = ttl
+
+def test_unknown_sensitivity_engine():
+    """Unknown engines on /api/sensitivity/<engine> are a 404."""
+    print("\nTesting unknown sensitivity engine...")
+    api, client = make_test_client()
+    response = client.post("/api/sensitivity/annealing", json=TEST_PORTFOLIO_REQUEST)
+    assert response.status_code == 404 and response.get_json()["success"] is False
+    print("✅ Unknown engine rejected with 404")
+
+def test_malformed_sensitivity_params():
+    """Badly typed range and steps values are a 400, not a server error."""
+    print("\nTesting malformed sensitivity parameters...")
+    api, client = make_test_client()
+    cases = {
+        "missing range": {"range": None},
+        "string range": {"range": "0.15,0.25"},
+        "non-numeric range values": {"range": ["low", "high"]},
+        "string steps": {"steps": "3"},
+    }
+    for label, override in cases.items():
+        response = client.post("/api/sensitivity/classical", json={**TEST_PORTFOLIO_REQUEST, **override})
+        assert response.status_code == 400, f"{label}: got {response.status_code}"
+        assert response.get_json()["success"] is False
+        print(f"✅ {label.capitalize()} rejected with 400")
+
+if __name__ == "__main__":
+    test_sensitivity_job_lifecycle()
+    test_sensitivity_job_expiry()
+    test_unknown_sensitivity_engine()
+    test_malformed_sensitivity_params()